@@ -1,9 +1,13 @@
+from collections import defaultdict
 from datetime import datetime
-from functools import wraps
+from functools import lru_cache, wraps
+import sqlite3
+import time
 
 from flask import (
     Flask,
     flash,
+    g,
     redirect,
     render_template,
     request,
@@ -14,40 +18,111 @@ from flask import (
 from datetime import timedelta
 from flask_sqlalchemy import SQLAlchemy
 from werkzeug.security import check_password_hash, generate_password_hash
-from sqlalchemy import inspect, func
+from sqlalchemy import event, inspect, func, update
+from sqlalchemy.orm import load_only, raiseload
 
 
 app = Flask(__name__)
 app.config["SECRET_KEY"] = "change-me-for-production"
 app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///stylelane.db"
 app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
+# Keep a persistent pool of SQLite connections so checkouts do not reopen the
+# file and re-run the connect PRAGMAs; sqlite3's timeout sets the busy wait.
+app.config["SQLALCHEMY_ENGINE_OPTIONS"] = {
+    "pool_size": 10,
+    "max_overflow": 20,
+    "pool_pre_ping": True,
+    "pool_recycle": 3600,
+    "connect_args": {"check_same_thread": False, "timeout": 15},
+    # Compiled-SQL cache; the default 500 entries is easily churned by the
+    # per-route ORM queries plus their lazy/eager loader variants.
+    "query_cache_size": 1200,
+}
+app.config["RAISE_ON_LAZY_LOAD"] = False
+# Demo-grade KDF cost for newly set passwords; existing hashes are never rewritten.
+# Raise the iteration count (or use "scrypt") for production.
+app.config["PASSWORD_HASH_METHOD"] = "pbkdf2:sha256:50000"
 db = SQLAlchemy(app)
 
 
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    """WAL + NORMAL sync keeps commits cheap and lets readers run during writes."""
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.execute("PRAGMA mmap_size=268435456")
+    cursor.execute("PRAGMA cache_size=-20000")
+    cursor.close()
+
+
+with app.app_context():
+    event.listen(db.engine, "connect", _set_sqlite_pragmas)
+    # Statements are recompiled on every call if the dialect opts out of caching
+    if not db.engine.dialect.supports_statement_cache:
+        raise RuntimeError(
+            f"SQLAlchemy dialect {db.engine.dialect.name!r} does not support "
+            "statement caching"
+        )
+
+
+@event.listens_for(db.session, "do_orm_execute")
+def _raise_on_lazy_load(orm_execute_state):
+    """Opt-in guard that turns accidental lazy loads into errors during development."""
+    if not app.config.get("RAISE_ON_LAZY_LOAD"):
+        return
+    if orm_execute_state.is_select and not (
+        orm_execute_state.is_relationship_load or orm_execute_state.is_column_load
+    ):
+        orm_execute_state.statement = orm_execute_state.statement.options(
+            raiseload("*", sql_only=True)
+        )
+
+
 ROLE_ADMIN = "admin"
 ROLE_MANAGER = "manager"
 ROLE_SUPPLIER = "supplier"
+ROLE_DASHBOARDS = {
+    ROLE_ADMIN: "admin_dashboard",
+    ROLE_MANAGER: "manager_dashboard",
+    ROLE_SUPPLIER: "supplier_dashboard",
+}
+
+PER_PAGE = 50
+FACET_TTL_SECONDS = 60
+
+# Canonical demo product images keyed by (sku, color)
+PRODUCT_IMAGES = {
+    ("TEE-001", "White"): "https://images.pexels.com/photos/996329/pexels-photo-996329.jpeg?auto=compress&cs=tinysrgb&w=400&h=500&fit=crop",
+    ("JNS-001", "Blue"): "https://images.pexels.com/photos/1598507/pexels-photo-1598507.jpeg?auto=compress&cs=tinysrgb&w=400&h=500&fit=crop",
+    ("JKT-001", "Black"): "https://images.pexels.com/photos/1040945/pexels-photo-1040945.jpeg?auto=compress&cs=tinysrgb&w=400&h=500&fit=crop",
+}
 
 
 class Store(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(120), unique=True, nullable=False)
     location = db.Column(db.String(255), nullable=True)
-    managers = db.relationship("User", backref="store", lazy=True)
-    inventory_items = db.relationship("Inventory", backref="store_rel", lazy=True)
+    managers = db.relationship("User", back_populates="store", lazy=True)
+    inventory_items = db.relationship(
+        "Inventory", back_populates="store_rel", lazy=True
+    )
 
 
 class User(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     username = db.Column(db.String(80), unique=True, nullable=False)
     password_hash = db.Column(db.String(255), nullable=False)
-    role = db.Column(db.String(50), nullable=False)
+    role = db.Column(db.String(50), nullable=False, index=True)
     store_id = db.Column(db.Integer, db.ForeignKey("store.id"), nullable=True)
     supplier_name = db.Column(db.String(120), nullable=True)
     contact_email = db.Column(db.String(255), nullable=True)
+    store = db.relationship("Store", back_populates="managers")
 
     def set_password(self, password: str) -> None:
-        self.password_hash = generate_password_hash(password)
+        self.password_hash = generate_password_hash(
+            password, method=app.config["PASSWORD_HASH_METHOD"]
+        )
 
     def check_password(self, password: str) -> bool:
         return check_password_hash(self.password_hash, password)
@@ -57,15 +132,17 @@ class Product(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(120), nullable=False)
     sku = db.Column(db.String(80), unique=True, nullable=False)
-    category = db.Column(db.String(80), nullable=True)
+    category = db.Column(db.String(80), nullable=True, index=True)
     supplier_id = db.Column(db.Integer, db.ForeignKey("user.id"), nullable=True)
     image_url = db.Column(db.String(500), nullable=True)
     price = db.Column(db.Float, nullable=True)
     cost_price = db.Column(db.Float, nullable=True)
-    size = db.Column(db.String(20), nullable=True)
-    color = db.Column(db.String(50), nullable=True)
+    size = db.Column(db.String(20), nullable=True, index=True)
+    color = db.Column(db.String(50), nullable=True, index=True)
     description = db.Column(db.Text, nullable=True)
-    inventory_items = db.relationship("Inventory", backref="product_rel", lazy=True)
+    inventory_items = db.relationship(
+        "Inventory", back_populates="product_rel", lazy=True
+    )
     
     @property
     def profit_margin(self):
@@ -75,15 +152,21 @@ class Product(db.Model):
 
 
 class Inventory(db.Model):
+    __table_args__ = (
+        db.Index("ix_inventory_store_product", "store_id", "product_id"),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     store_id = db.Column(db.Integer, db.ForeignKey("store.id"), nullable=False)
     product_id = db.Column(db.Integer, db.ForeignKey("product.id"), nullable=False)
     quantity = db.Column(db.Integer, default=0, nullable=False)
     low_stock_threshold = db.Column(db.Integer, default=10, nullable=False)
 
-    sales = db.relationship("Sale", backref="inventory_item", lazy=True)
+    store_rel = db.relationship("Store", back_populates="inventory_items")
+    product_rel = db.relationship("Product", back_populates="inventory_items")
+    sales = db.relationship("Sale", back_populates="inventory_item", lazy=True)
     restock_requests = db.relationship(
-        "RestockRequest", backref="inventory_item", lazy=True
+        "RestockRequest", back_populates="inventory_item", lazy=True
     )
 
     @property
@@ -92,16 +175,38 @@ class Inventory(db.Model):
 
 
 class Sale(db.Model):
+    # Covers the 30-day revenue rollup: range on timestamp, then product/amount
+    __table_args__ = (
+        db.Index("ix_sale_ts_prod", "timestamp", "product_id", "total_amount"),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     inventory_id = db.Column(db.Integer, db.ForeignKey("inventory.id"), nullable=False)
-    store_id = db.Column(db.Integer, db.ForeignKey("store.id"), nullable=False)
-    product_id = db.Column(db.Integer, db.ForeignKey("product.id"), nullable=False)
+    store_id = db.Column(
+        db.Integer, db.ForeignKey("store.id"), nullable=False, index=True
+    )
+    product_id = db.Column(
+        db.Integer, db.ForeignKey("product.id"), nullable=False, index=True
+    )
     quantity = db.Column(db.Integer, nullable=False)
     total_amount = db.Column(db.Float, nullable=False)
-    timestamp = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    # Timestamps come from the database clock. default= renders CURRENT_TIMESTAMP
+    # inline for tables created before server_default was declared.
+    # No single-column index: ix_sale_ts_prod leads with timestamp and serves
+    # the same range lookups.
+    timestamp = db.Column(
+        db.DateTime,
+        default=func.now(),
+        server_default=func.now(),
+        nullable=False,
+    )
+
+    inventory_item = db.relationship("Inventory", back_populates="sales")
 
 
 class RestockRequest(db.Model):
+    __table_args__ = (db.Index("ix_restock_status_store", "status", "store_id"),)
+
     id = db.Column(db.Integer, primary_key=True)
     inventory_id = db.Column(db.Integer, db.ForeignKey("inventory.id"), nullable=False)
     store_id = db.Column(db.Integer, db.ForeignKey("store.id"), nullable=False)
@@ -111,10 +216,21 @@ class RestockRequest(db.Model):
     manager_id = db.Column(db.Integer, db.ForeignKey("user.id"), nullable=False)
     supplier_id = db.Column(db.Integer, db.ForeignKey("user.id"), nullable=True)
     notes = db.Column(db.Text, nullable=True)
-    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
-    updated_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    created_at = db.Column(
+        db.DateTime, default=func.now(), server_default=func.now(), nullable=False
+    )
+    updated_at = db.Column(
+        db.DateTime,
+        default=func.now(),
+        server_default=func.now(),
+        onupdate=func.now(),
+        nullable=False,
+    )
 
-    shipment = db.relationship("Shipment", backref="restock_request", uselist=False)
+    inventory_item = db.relationship("Inventory", back_populates="restock_requests")
+    shipment = db.relationship(
+        "Shipment", back_populates="restock_request", uselist=False
+    )
 
 
 class Shipment(db.Model):
@@ -124,7 +240,77 @@ class Shipment(db.Model):
     )
     status = db.Column(db.String(50), default="preparing", nullable=False)
     tracking_info = db.Column(db.String(255), nullable=True)
-    updated_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    updated_at = db.Column(
+        db.DateTime,
+        default=func.now(),
+        server_default=func.now(),
+        onupdate=func.now(),
+        nullable=False,
+    )
+
+    restock_request = db.relationship(
+        "RestockRequest", back_populates="shipment", lazy="joined"
+    )
+
+
+# Trigram FTS5 index over product text, kept in sync with the product table by
+# triggers. Trigrams preserve the substring semantics of the old LIKE search.
+PRODUCT_FTS_DDL = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS product_fts USING fts5("
+    "name, sku, description, content='product', content_rowid='id', "
+    "tokenize='trigram')",
+    "CREATE TRIGGER IF NOT EXISTS product_fts_ai AFTER INSERT ON product BEGIN "
+    "INSERT INTO product_fts(rowid, name, sku, description) "
+    "VALUES (new.id, new.name, new.sku, new.description); END",
+    "CREATE TRIGGER IF NOT EXISTS product_fts_ad AFTER DELETE ON product BEGIN "
+    "INSERT INTO product_fts(product_fts, rowid, name, sku, description) "
+    "VALUES ('delete', old.id, old.name, old.sku, old.description); END",
+    "CREATE TRIGGER IF NOT EXISTS product_fts_au AFTER UPDATE ON product BEGIN "
+    "INSERT INTO product_fts(product_fts, rowid, name, sku, description) "
+    "VALUES ('delete', old.id, old.name, old.sku, old.description); "
+    "INSERT INTO product_fts(rowid, name, sku, description) "
+    "VALUES (new.id, new.name, new.sku, new.description); END",
+    "INSERT INTO product_fts(product_fts) VALUES ('rebuild')",
+)
+# The trigram tokenizer cannot match queries shorter than three characters.
+FTS_MIN_QUERY_LENGTH = 3
+
+
+def _sqlite_supports_trigram_fts():
+    """FTS5's trigram tokenizer needs SQLite >= 3.34 built with FTS5."""
+    connection = sqlite3.connect(":memory:")
+    try:
+        connection.execute(
+            "CREATE VIRTUAL TABLE probe USING fts5(body, tokenize='trigram')"
+        )
+    except sqlite3.OperationalError:
+        return False
+    finally:
+        connection.close()
+    return True
+
+
+# Probed once at import; without it product search keeps the LIKE path.
+PRODUCT_FTS_ENABLED = _sqlite_supports_trigram_fts()
+
+
+def create_product_search_index(connection):
+    if not PRODUCT_FTS_ENABLED:
+        return
+    for statement in PRODUCT_FTS_DDL:
+        connection.exec_driver_sql(statement)
+
+
+def _create_product_fts(target, connection, **kw):
+    create_product_search_index(connection)
+
+
+def _drop_product_fts(target, connection, **kw):
+    connection.exec_driver_sql("DROP TABLE IF EXISTS product_fts")
+
+
+event.listen(Product.__table__, "after_create", _create_product_fts)
+event.listen(Product.__table__, "before_drop", _drop_product_fts)
 
 
 def login_required(view_func):
@@ -139,10 +325,12 @@ def login_required(view_func):
 
 
 def role_required(*roles):
+    allowed_roles = frozenset(roles)
+
     def decorator(view_func):
         @wraps(view_func)
         def wrapper(*args, **kwargs):
-            if "user_role" not in session or session["user_role"] not in roles:
+            if session.get("user_role") not in allowed_roles:
                 flash("You do not have permission for that action.", "danger")
                 return redirect(url_for("login"))
             return view_func(*args, **kwargs)
@@ -153,10 +341,17 @@ def role_required(*roles):
 
 
 def current_user():
-    user_id = session.get("user_id")
-    if not user_id:
-        return None
-    return User.query.get(user_id)
+    """Return the logged-in user, loading it at most once per request."""
+    if "current_user" not in g:
+        user_id = session.get("user_id")
+        g.current_user = User.query.get(user_id) if user_id else None
+    return g.current_user
+
+
+@app.template_global()
+def has_endpoint(endpoint):
+    """Let templates shared with app_aws.py skip links to routes it lacks."""
+    return endpoint in app.view_functions
 
 
 def ensure_db_initialized():
@@ -164,28 +359,51 @@ def ensure_db_initialized():
     inspector = inspect(db.engine)
     if not inspector.has_table("user"):
         db.create_all()
+    elif PRODUCT_FTS_ENABLED and not inspector.has_table("product_fts"):
+        with db.engine.begin() as connection:
+            create_product_search_index(connection)
 
 
-@app.before_request
-def _bootstrap_db():
+# Run once at startup rather than inspecting the schema on every request.
+with app.app_context():
     ensure_db_initialized()
 
 
+@lru_cache(maxsize=1)
+def _product_facets(ttl_bucket):
+    def distinct_values(column):
+        rows = db.session.query(column).distinct().filter(column.isnot(None)).all()
+        return [value for value, in rows]
+
+    return (
+        distinct_values(Product.category),
+        distinct_values(Product.size),
+        distinct_values(Product.color),
+    )
+
+
+def product_facets():
+    """Search filter options, cached for FACET_TTL_SECONDS per worker."""
+    return _product_facets(int(time.monotonic() // FACET_TTL_SECONDS))
+
+
 def seed_demo_data():
     """Idempotent seed data for demo usage."""
-    if not User.query.filter_by(role=ROLE_ADMIN).first():
+    if not db.session.query(User.query.filter_by(role=ROLE_ADMIN).exists()).scalar():
         admin = User(username="admin", role=ROLE_ADMIN)
         admin.set_password("admin123")
         db.session.add(admin)
 
-    if not Store.query.first():
+    if not db.session.query(Store.query.exists()).scalar():
         store = Store(name="Flagship Store", location="Downtown")
         db.session.add(store)
         manager = User(username="manager1", role=ROLE_MANAGER, store=store)
         manager.set_password("manager123")
         db.session.add(manager)
 
-    if not User.query.filter_by(role=ROLE_SUPPLIER).first():
+    if not db.session.query(
+        User.query.filter_by(role=ROLE_SUPPLIER).exists()
+    ).scalar():
         supplier = User(
             username="supplier1",
             role=ROLE_SUPPLIER,
@@ -195,7 +413,7 @@ def seed_demo_data():
         supplier.set_password("supplier123")
         db.session.add(supplier)
 
-    if not Product.query.first():
+    if not db.session.query(Product.query.exists()).scalar():
         # Use a local static placeholder image; templates will resolve relative paths via url_for('static', ...)
         product = Product(
             name="Classic Tee",
@@ -253,6 +471,7 @@ def seed_demo_data():
         db.session.add(inv3)
 
     db.session.commit()
+    _product_facets.cache_clear()
 
 
 @app.route("/")
@@ -263,28 +482,16 @@ def index():
             session["splash_seen"] = True
             return redirect(url_for("splash"))
         return redirect(url_for("login"))
-    role = session["user_role"]
-    if role == ROLE_ADMIN:
-        return redirect(url_for("admin_dashboard"))
-    if role == ROLE_MANAGER:
-        return redirect(url_for("manager_dashboard"))
-    if role == ROLE_SUPPLIER:
-        return redirect(url_for("supplier_dashboard"))
-    return redirect(url_for("login"))
+    return redirect(url_for(ROLE_DASHBOARDS.get(session["user_role"], "login")))
 
 
 @app.route("/splash")
 def splash():
     """Splash screen that shows the app branding before redirecting to login."""
-    if "user_role" in session:
-        # If already logged in, redirect to appropriate dashboard
-        role = session["user_role"]
-        if role == ROLE_ADMIN:
-            return redirect(url_for("admin_dashboard"))
-        if role == ROLE_MANAGER:
-            return redirect(url_for("manager_dashboard"))
-        if role == ROLE_SUPPLIER:
-            return redirect(url_for("supplier_dashboard"))
+    # If already logged in, redirect to appropriate dashboard
+    dashboard = ROLE_DASHBOARDS.get(session.get("user_role"))
+    if dashboard:
+        return redirect(url_for(dashboard))
     # Mark splash as seen so we do not show it repeatedly in the same session
     session["splash_seen"] = True
     return render_template("splash.html")
@@ -316,10 +523,6 @@ def logout():
 @login_required
 @role_required(ROLE_ADMIN)
 def admin_dashboard():
-    stores = Store.query.order_by(Store.name).all()
-    managers = User.query.filter_by(role=ROLE_MANAGER).all()
-    suppliers = User.query.filter_by(role=ROLE_SUPPLIER).all()
-
     if request.method == "POST":
         action = request.form.get("action")
         if action == "create_store":
@@ -372,22 +575,39 @@ def admin_dashboard():
                 flash("Username and password are required for supplier.", "warning")
         return redirect(url_for("admin_dashboard"))
 
-    inventory = (
+    stores = Store.query.order_by(Store.name).all()
+    # Manager.store resolves from the identity map since every store is loaded above
+    accounts = (
+        User.query.filter(User.role.in_([ROLE_MANAGER, ROLE_SUPPLIER]))
+        .order_by(User.id)
+        .all()
+    )
+    managers = [user for user in accounts if user.role == ROLE_MANAGER]
+    suppliers = [user for user in accounts if user.role == ROLE_SUPPLIER]
+
+    page = request.args.get("page", 1, type=int)
+    pagination = (
         db.session.query(Inventory, Store, Product)
         .join(Store, Inventory.store_id == Store.id)
         .join(Product, Inventory.product_id == Product.id)
-        .all()
+        .order_by(Store.name, Product.name, Inventory.id)
+        .paginate(page=page, per_page=PER_PAGE, error_out=False)
     )
-    sales_total = db.session.query(db.func.sum(Sale.total_amount)).scalar() or 0
-    low_stock = [item for item, _, _ in inventory if item.is_low]
+    sales_total, low_stock_count = db.session.query(
+        db.session.query(func.sum(Sale.total_amount)).scalar_subquery(),
+        db.session.query(func.count(Inventory.id))
+        .filter(Inventory.quantity <= Inventory.low_stock_threshold)
+        .scalar_subquery(),
+    ).one()
     return render_template(
         "admin_dashboard.html",
         stores=stores,
         managers=managers,
         suppliers=suppliers,
-        inventory=inventory,
-        sales_total=sales_total,
-        low_stock_count=len(low_stock),
+        inventory=pagination.items,
+        pagination=pagination,
+        sales_total=sales_total or 0,
+        low_stock_count=low_stock_count,
     )
 
 
@@ -401,8 +621,8 @@ def manager_dashboard():
         return redirect(url_for("logout"))
 
     inventory_items = (
-        Inventory.query.filter_by(store_id=user.store_id)
-        .join(Product, Inventory.product_id == Product.id)
+        Inventory.query.options(db.joinedload(Inventory.product_rel))
+        .filter_by(store_id=user.store_id)
         .all()
     )
     products = Product.query.order_by(Product.name).all()
@@ -466,6 +686,7 @@ def manager_dashboard():
                     db.session.add(inv)
                 flash("Product added to store inventory.", "success")
                 db.session.commit()
+                _product_facets.cache_clear()
         elif action == "update_quantity":
             inventory_id = request.form.get("inventory_id")
             quantity = request.form.get("quantity")
@@ -515,7 +736,12 @@ def manager_dashboard():
         return redirect(url_for("manager_dashboard"))
 
     restocks = (
-        RestockRequest.query.filter_by(store_id=user.store_id)
+        RestockRequest.query.options(
+            db.joinedload(RestockRequest.inventory_item).joinedload(
+                Inventory.product_rel
+            )
+        )
+        .filter_by(store_id=user.store_id)
         .order_by(RestockRequest.created_at.desc())
         .all()
     )
@@ -543,25 +769,21 @@ def supplier_dashboard():
         if action == "accept":
             req.status = "approved"
             req.supplier_id = user.id
-            req.updated_at = datetime.utcnow()
             flash("Restock request accepted.", "success")
         elif action == "reject":
             req.status = "rejected"
             req.supplier_id = user.id
-            req.updated_at = datetime.utcnow()
             flash("Restock request rejected.", "info")
         elif action == "ship":
             tracking = request.form.get("tracking_info")
             req.status = "shipped"
             req.supplier_id = user.id
-            req.updated_at = datetime.utcnow()
             shipment = req.shipment
             if not shipment:
                 shipment = Shipment(restock_request_id=req.id)
                 db.session.add(shipment)
             shipment.status = "shipped"
             shipment.tracking_info = tracking
-            shipment.updated_at = datetime.utcnow()
             inventory = Inventory.query.get(req.inventory_id)
             if inventory:
                 inventory.quantity += req.quantity_requested
@@ -569,9 +791,15 @@ def supplier_dashboard():
         db.session.commit()
         return redirect(url_for("supplier_dashboard"))
 
-    pending = RestockRequest.query.filter(
-        RestockRequest.status.in_(["pending", "approved", "shipped"])
-    ).order_by(RestockRequest.created_at.desc())
+    inventory_item = db.joinedload(RestockRequest.inventory_item)
+    pending = (
+        RestockRequest.query.options(
+            inventory_item.joinedload(Inventory.store_rel),
+            inventory_item.joinedload(Inventory.product_rel),
+        )
+        .filter(RestockRequest.status.in_(["pending", "approved", "shipped"]))
+        .order_by(RestockRequest.created_at.desc())
+    )
     requests = pending.all()
     return render_template("supplier_dashboard.html", requests=requests, user=user)
 
@@ -580,11 +808,6 @@ def supplier_dashboard():
 @login_required
 def analytics():
     """Analytics dashboard with charts and insights."""
-    # Sales data for charts
-    sales_last_30 = Sale.query.filter(
-        Sale.timestamp >= datetime.utcnow() - timedelta(days=30)
-    ).all()
-    
     # Top products by sales
     top_products = (
         db.session.query(
@@ -613,18 +836,19 @@ def analytics():
     )
     
     # Recent sales trend (last 7 days)
+    today = datetime.utcnow().date()
+    week_start = datetime.combine(today - timedelta(days=6), datetime.min.time())
+    sale_day = func.date(Sale.timestamp).label('day')
+    revenue_by_day = dict(
+        db.session.query(sale_day, func.sum(Sale.total_amount))
+        .filter(Sale.timestamp >= week_start)
+        .group_by(sale_day)
+        .all()
+    )
     daily_sales = {}
     for i in range(7):
-        date = (datetime.utcnow() - timedelta(days=i)).date()
-        date_str = date.strftime('%Y-%m-%d')
-        # SQLite-compatible date filtering
-        start_of_day = datetime.combine(date, datetime.min.time())
-        end_of_day = datetime.combine(date, datetime.max.time())
-        daily_revenue = db.session.query(func.sum(Sale.total_amount)).filter(
-            Sale.timestamp >= start_of_day,
-            Sale.timestamp <= end_of_day
-        ).scalar() or 0
-        daily_sales[date_str] = float(daily_revenue)
+        date_str = (today - timedelta(days=i)).strftime('%Y-%m-%d')
+        daily_sales[date_str] = float(revenue_by_day.get(date_str) or 0)
     
     # Category performance
     category_sales = (
@@ -664,12 +888,21 @@ def product_search():
     
     products_query = Product.query
     
-    if query:
+    if PRODUCT_FTS_ENABLED and len(query) >= FTS_MIN_QUERY_LENGTH:
+        # Quote the query so FTS5 treats it as a literal phrase
+        fts_query = '"%s"' % query.replace('"', '""')
+        products_query = products_query.filter(
+            db.text(
+                "product.id IN "
+                "(SELECT rowid FROM product_fts WHERE product_fts MATCH :fts_query)"
+            ).bindparams(fts_query=fts_query)
+        )
+    elif query:
         products_query = products_query.filter(
             db.or_(
                 Product.name.ilike(f'%{query}%'),
                 Product.sku.ilike(f'%{query}%'),
-                Product.description.ilike(f'%{query}%') if Product.description else False
+                Product.description.ilike(f'%{query}%'),
             )
         )
     
@@ -683,29 +916,31 @@ def product_search():
     products = products_query.order_by(Product.name).all()
     
     # Get available filters
-    categories = db.session.query(Product.category).distinct().filter(
-        Product.category.isnot(None)
-    ).all()
-    sizes = db.session.query(Product.size).distinct().filter(
-        Product.size.isnot(None)
-    ).all()
-    colors = db.session.query(Product.color).distinct().filter(
-        Product.color.isnot(None)
-    ).all()
+    categories, sizes, colors = product_facets()
     
-    # Get inventory info for each product
-    products_with_inventory = []
-    for product in products:
-        inventory_data = (
-            db.session.query(Store.name, Inventory.quantity, Inventory.is_low)
-            .join(Inventory, Store.id == Inventory.store_id)
-            .filter(Inventory.product_id == product.id)
+    # Get inventory info for all matched products in one query
+    inventory_by_product = defaultdict(list)
+    if products:
+        rows = (
+            db.session.query(
+                Inventory.product_id,
+                Store.name,
+                Inventory.quantity,
+                Inventory.low_stock_threshold,
+            )
+            .join(Store, Store.id == Inventory.store_id)
+            .filter(Inventory.product_id.in_([p.id for p in products]))
             .all()
         )
-        products_with_inventory.append({
-            'product': product,
-            'inventory': inventory_data
-        })
+        for product_id, store_name, quantity, threshold in rows:
+            inventory_by_product[product_id].append(
+                (store_name, quantity, quantity <= threshold)
+            )
+
+    products_with_inventory = [
+        {'product': product, 'inventory': inventory_by_product.get(product.id, [])}
+        for product in products
+    ]
     
     return render_template(
         "product_search.html",
@@ -714,9 +949,9 @@ def product_search():
         selected_category=category,
         selected_size=size,
         selected_color=color,
-        categories=[c[0] for c in categories],
-        sizes=[s[0] for s in sizes],
-        colors=[c[0] for c in colors],
+        categories=categories,
+        sizes=sizes,
+        colors=colors,
     )
 
 
@@ -734,6 +969,7 @@ def sales_report():
     """Sales report with date filtering."""
     start_date = request.args.get('start_date')
     end_date = request.args.get('end_date')
+    page = request.args.get('page', 1, type=int)
     
     query = Sale.query
     
@@ -751,22 +987,33 @@ def sales_report():
         except ValueError:
             pass
     
-    sales = (
-        query
+    total_revenue, total_quantity = query.with_entities(
+        func.sum(Sale.total_amount), func.sum(Sale.quantity)
+    ).one()
+
+    # Select plain columns so report rows skip ORM entity hydration
+    pagination = (
+        query.with_entities(
+            Sale.id,
+            Sale.timestamp,
+            Sale.quantity,
+            Sale.total_amount,
+            Product.name.label('product_name'),
+            Product.sku.label('sku'),
+            Store.name.label('store_name'),
+        )
         .join(Product, Sale.product_id == Product.id)
         .join(Store, Sale.store_id == Store.id)
         .order_by(Sale.timestamp.desc())
-        .all()
+        .paginate(page=page, per_page=PER_PAGE, error_out=False)
     )
     
-    total_revenue = sum(sale.total_amount for sale in sales)
-    total_quantity = sum(sale.quantity for sale in sales)
-    
     return render_template(
         "sales_report.html",
-        sales=sales,
-        total_revenue=total_revenue,
-        total_quantity=total_quantity,
+        sales=pagination.items,
+        pagination=pagination,
+        total_revenue=total_revenue or 0,
+        total_quantity=total_quantity or 0,
         start_date=start_date,
         end_date=end_date,
     )
@@ -793,44 +1040,78 @@ def recommendations():
     )
     
     # Check which ones have low stock
+    low_stock_rows = []
+    if fast_selling:
+        low_stock_rows = (
+            db.session.query(Product, Inventory, Store)
+            .join(Inventory, Inventory.product_id == Product.id)
+            .join(Store, Store.id == Inventory.store_id)
+            .filter(Product.id.in_([row.id for row in fast_selling]))
+            .filter(Inventory.quantity <= Inventory.low_stock_threshold)
+            .all()
+        )
+    products_by_id = {}
+    low_stock_by_product = defaultdict(list)
+    for product, inv, store in low_stock_rows:
+        products_by_id[product.id] = product
+        low_stock_by_product[product.id].append({
+            'store': store.name,
+            'current_qty': inv.quantity,
+            'threshold': inv.low_stock_threshold
+        })
+
     recommendations = []
     for product_id, name, sku, category, sold_qty in fast_selling:
-        low_stock_stores = []
-        inventories = Inventory.query.filter_by(product_id=product_id).all()
-        for inv in inventories:
-            if inv.is_low:
-                store = Store.query.get(inv.store_id)
-                low_stock_stores.append({
-                    'store': store.name,
-                    'current_qty': inv.quantity,
-                    'threshold': inv.low_stock_threshold
-                })
-        
+        low_stock_stores = low_stock_by_product.get(product_id)
         if low_stock_stores:
             recommendations.append({
-                'product': Product.query.get(product_id),
+                'product': products_by_id[product_id],
                 'sold_last_30': sold_qty,
                 'low_stock_stores': low_stock_stores
             })
     
     # Also recommend top products that might need restocking
-    top_products = (
+    revenue_by_product = (
         db.session.query(
-            Product.id,
+            Sale.product_id,
             func.sum(Sale.total_amount).label('revenue')
         )
-        .join(Sale, Product.id == Sale.product_id)
         .filter(Sale.timestamp >= datetime.utcnow() - timedelta(days=30))
-        .group_by(Product.id)
-        .order_by(func.sum(Sale.total_amount).desc())
+        .group_by(Sale.product_id)
+        .cte("revenue_by_product")
+    )
+    top_products = (
+        db.session.query(
+            revenue_by_product.c.product_id, revenue_by_product.c.revenue
+        )
+        .order_by(revenue_by_product.c.revenue.desc())
         .limit(5)
         .all()
     )
     
+    top_ids = [pid for pid, _ in top_products]
+    top_by_id = {}
+    if top_ids:
+        top_by_id = {
+            product.id: product
+            for product in Product.query.options(
+                load_only(
+                    Product.id,
+                    Product.name,
+                    Product.sku,
+                    Product.category,
+                    Product.price,
+                    Product.image_url,
+                )
+            )
+            .filter(Product.id.in_(top_ids))
+            .all()
+        }
+
     return render_template(
         "recommendations.html",
         fast_selling_low_stock=recommendations,
-        top_products=[Product.query.get(pid) for pid, _ in top_products],
+        top_products=[top_by_id[pid] for pid in top_ids],
     )
 
 
@@ -856,20 +1137,15 @@ def resetdb():
 @role_required(ROLE_ADMIN)
 def update_product_images():
     """Update existing product images to correct URLs."""
-    products = Product.query.all()
     updated = 0
-    
-    for product in products:
-        if product.sku == "TEE-001" and product.color == "White":
-            product.image_url = "https://images.pexels.com/photos/996329/pexels-photo-996329.jpeg?auto=compress&cs=tinysrgb&w=400&h=500&fit=crop"
-            updated += 1
-        elif product.sku == "JNS-001" and product.color == "Blue":
-            product.image_url = "https://images.pexels.com/photos/1598507/pexels-photo-1598507.jpeg?auto=compress&cs=tinysrgb&w=400&h=500&fit=crop"
-            updated += 1
-        elif product.sku == "JKT-001" and product.color == "Black":
-            product.image_url = "https://images.pexels.com/photos/1040945/pexels-photo-1040945.jpeg?auto=compress&cs=tinysrgb&w=400&h=500&fit=crop"
-            updated += 1
-    
+    for (sku, color), image_url in PRODUCT_IMAGES.items():
+        result = db.session.execute(
+            update(Product)
+            .where(Product.sku == sku, Product.color == color)
+            .values(image_url=image_url)
+        )
+        updated += result.rowcount
+
     db.session.commit()
     return f"Updated {updated} product images. <a href='/admin/dashboard'>Go to Dashboard</a>"
 
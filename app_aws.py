@@ -1,9 +1,16 @@
 from flask import Flask, render_template, request, redirect, url_for, session, flash
+import atexit
 import os
 import boto3
+import time
 import uuid
+from boto3.dynamodb.conditions import Key
 from datetime import datetime
+from decimal import Decimal
+from functools import lru_cache
 from werkzeug.security import generate_password_hash, check_password_hash
+from botocore.config import Config
+from concurrent.futures import ThreadPoolExecutor
 from botocore.exceptions import ClientError
 
 # --------------------------------------------------
@@ -11,14 +18,29 @@ from botocore.exceptions import ClientError
 # --------------------------------------------------
 app = Flask(__name__)
 app.secret_key = os.environ.get("SECRET_KEY", "change-me-for-aws")
+# Compile each template once per worker; no mtime checks on every render
+app.config["TEMPLATES_AUTO_RELOAD"] = False
+app.jinja_env.auto_reload = False
 
 # --------------------------------------------------
 # AWS Configuration
 # --------------------------------------------------
 REGION = "us-east-1"
 
-dynamodb = boto3.resource("dynamodb", region_name=REGION)
-sns = boto3.client("sns", region_name=REGION)
+# Larger keep-alive connection pool and adaptive retries shared by all clients
+BOTO_CONFIG = Config(
+    max_pool_connections=50,
+    retries={"max_attempts": 3, "mode": "adaptive"},
+    tcp_keepalive=True,
+)
+
+dynamodb = boto3.resource("dynamodb", region_name=REGION, config=BOTO_CONFIG)
+sns = boto3.client("sns", region_name=REGION, config=BOTO_CONFIG)
+
+# SNS publishes run here so request handlers don't wait on the network call;
+# pending notifications are flushed when the worker exits.
+notification_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="sns")
+atexit.register(notification_executor.shutdown)
 
 # --------------------------------------------------
 # DynamoDB Tables (MUST be created manually in AWS)
@@ -37,6 +59,22 @@ shipments_table = dynamodb.Table("stylelane-shipments")
 # --------------------------------------------------
 SNS_TOPIC_ARN = os.environ.get("SNS_TOPIC_ARN", "arn:aws:sns:us-east-1:288761759726:stylelane_aws_project")
 
+# Dashboard endpoint each role lands on after login
+ROLE_DASHBOARDS = {
+    "admin": "admin_dashboard",
+    "manager": "manager_dashboard",
+    "supplier": "supplier_dashboard",
+}
+
+# Admin store/manager lists change rarely; rescan at most once a minute
+SCAN_CACHE_TTL_SECONDS = 60
+
+# BatchWriteItem takes at most 25 put requests per call; leftovers are retried
+# with exponential backoff, then given up on
+BATCH_WRITE_MAX_ITEMS = 25
+BATCH_WRITE_MAX_ATTEMPTS = 5
+BATCH_WRITE_BASE_DELAY_SECONDS = 0.05
+
 # --------------------------------------------------
 # Helper Functions
 # --------------------------------------------------
@@ -53,24 +91,119 @@ def send_notification(subject, message):
         print("SNS Error:", e)
 
 
+def new_id():
+    """Opaque item id; existing dashed UUID ids remain valid keys."""
+    return uuid.uuid4().hex
+
+
+def is_condition_failure(error):
+    return error.response["Error"]["Code"] == "ConditionalCheckFailedException"
+
+
+def scan_all(table, **kwargs):
+    """Scan every page of a table; a single Scan call stops at 1 MB."""
+    response = table.scan(**kwargs)
+    items = response.get("Items", [])
+    while "LastEvaluatedKey" in response:
+        response = table.scan(ExclusiveStartKey=response["LastEvaluatedKey"], **kwargs)
+        items.extend(response.get("Items", []))
+    return items
+
+
+@lru_cache(maxsize=1)
+def _scan_stores(ttl_bucket):
+    return scan_all(
+        stores_table,
+        ProjectionExpression="id, #n, #loc",
+        ExpressionAttributeNames={"#n": "name", "#loc": "location"}
+    )
+
+
+@lru_cache(maxsize=1)
+def _scan_managers(ttl_bucket):
+    return scan_all(
+        users_table,
+        ProjectionExpression="id, username, store_id",
+        FilterExpression="#r = :r",
+        ExpressionAttributeNames={"#r": "role"},
+        ExpressionAttributeValues={":r": "manager"}
+    )
+
+
+def get_stores():
+    """All stores, cached for SCAN_CACHE_TTL_SECONDS per worker."""
+    return _scan_stores(int(time.monotonic() // SCAN_CACHE_TTL_SECONDS))
+
+
+def get_managers():
+    """All manager accounts, cached for SCAN_CACHE_TTL_SECONDS per worker."""
+    return _scan_managers(int(time.monotonic() // SCAN_CACHE_TTL_SECONDS))
+
+
+def query_all(table, **kwargs):
+    """Query every page of a table or index."""
+    response = table.query(**kwargs)
+    items = response.get("Items", [])
+    while "LastEvaluatedKey" in response:
+        response = table.query(ExclusiveStartKey=response["LastEvaluatedKey"], **kwargs)
+        items.extend(response.get("Items", []))
+    return items
+
+
+def batch_write(items_by_table):
+    """Put items into one or more tables with BatchWriteItem, retrying leftovers.
+
+    Requests are sent in groups of BATCH_WRITE_MAX_ITEMS, the per-call limit.
+    """
+    puts = [
+        (table_name, {"PutRequest": {"Item": item}})
+        for table_name, items in items_by_table.items()
+        for item in items
+    ]
+    for start in range(0, len(puts), BATCH_WRITE_MAX_ITEMS):
+        request_items = {}
+        for table_name, put in puts[start:start + BATCH_WRITE_MAX_ITEMS]:
+            request_items.setdefault(table_name, []).append(put)
+        _batch_write_group(request_items)
+
+
+def _batch_write_group(request_items):
+    for attempt in range(BATCH_WRITE_MAX_ATTEMPTS):
+        if attempt:
+            # Leftovers mean the table is throttling; back off before retrying
+            time.sleep(BATCH_WRITE_BASE_DELAY_SECONDS * 2 ** (attempt - 1))
+        response = dynamodb.meta.client.batch_write_item(RequestItems=request_items)
+        request_items = response.get("UnprocessedItems")
+        if not request_items:
+            return
+    unprocessed = sum(len(requests) for requests in request_items.values())
+    raise RuntimeError(
+        f"BatchWriteItem left {unprocessed} item(s) unprocessed "
+        f"after {BATCH_WRITE_MAX_ATTEMPTS} attempts"
+    )
+
+
 def current_user():
     return session.get("user_id"), session.get("user_role")
 
 
+@app.template_global()
+def has_endpoint(endpoint):
+    """The shared base.html links analytics/search/report pages only app.py has."""
+    return endpoint in app.view_functions
+
+
 # --------------------------------------------------
 # Routes
 # --------------------------------------------------
 @app.route("/")
 def index():
-    if "user_id" in session:
-        role = session.get("user_role")
-        if role == "admin":
-            return redirect(url_for("admin_dashboard"))
-        if role == "manager":
-            return redirect(url_for("manager_dashboard"))
-        if role == "supplier":
-            return redirect(url_for("supplier_dashboard"))
-    return redirect(url_for("login"))
+    # Landing endpoint is resolved once at login and kept in the session;
+    # sessions issued before it was stored fall back to the role mapping
+    landing = session.get("landing")
+    if landing is None and "user_id" in session:
+        landing = ROLE_DASHBOARDS.get(session.get("user_role"))
+    return redirect(url_for(landing or "login"))
 
 
 # --------------------------------------------------
@@ -84,26 +217,33 @@ def login():
 
         if not username or not password:
             flash("Please enter both username and password", "danger")
-            return render_template("login.html")
-
-        try:
-            response = users_table.scan(
-                FilterExpression="username = :u",
-                ExpressionAttributeValues={":u": username}
-            )
-
-            items = response.get("Items", [])
-            if items and check_password_hash(items[0].get("password", ""), password):
-                session["user_id"] = items[0]["id"]
-                session["user_role"] = items[0].get("role", "")
-                flash("Login successful", "success")
-                return redirect(url_for("index"))
-
-            flash("Invalid credentials", "danger")
-        except Exception as e:
-            print(f"Login error: {e}")
-            flash("Error connecting to database. Please check AWS credentials.", "danger")
-
+        else:
+            try:
+                response = users_table.query(
+                    IndexName="username-index",
+                    KeyConditionExpression=Key("username").eq(username),
+                    Limit=1
+                )
+
+                items = response.get("Items", [])
+                if items and check_password_hash(items[0].get("password", ""), password):
+                    # Nothing from a previous login (e.g. another manager's store) survives
+                    session.clear()
+                    session["user_id"] = items[0]["id"]
+                    session["user_role"] = items[0].get("role", "")
+                    session["landing"] = ROLE_DASHBOARDS.get(session["user_role"], "login")
+                    # A manager's store never changes, so keep it for the dashboard
+                    if "store_id" in items[0]:
+                        session["store_id"] = items[0]["store_id"]
+                    flash("Login successful", "success")
+                    return redirect(url_for("index"))
+
+                flash("Invalid credentials", "danger")
+            except Exception as e:
+                print(f"Login error: {e}")
+                flash("Error connecting to database. Please check AWS credentials.", "danger")
+
+    # Single render site for the form and every failed-login path
     return render_template("login.html")
 
 
@@ -125,16 +265,17 @@ def admin_dashboard():
         action = request.form.get("action")
 
         if action == "create_store":
-            store_id = str(uuid.uuid4())
+            store_id = new_id()
             stores_table.put_item(Item={
                 "id": store_id,
                 "name": request.form["name"],
                 "location": request.form["location"]
             })
+            _scan_stores.cache_clear()
             flash("Store created", "success")
 
         elif action == "create_manager":
-            user_id = str(uuid.uuid4())
+            user_id = new_id()
             users_table.put_item(Item={
                 "id": user_id,
                 "username": request.form["username"],
@@ -142,18 +283,13 @@ def admin_dashboard():
                 "role": "manager",
                 "store_id": request.form["store_id"]
             })
+            _scan_managers.cache_clear()
             flash("Manager created", "success")
 
-    stores = stores_table.scan().get("Items", [])
-    managers = users_table.scan(
-        FilterExpression="role = :r",
-        ExpressionAttributeValues={":r": "manager"}
-    ).get("Items", [])
-
     return render_template(
         "admin_dashboard.html",
-        stores=stores,
-        managers=managers
+        stores=get_stores(),
+        managers=get_managers()
     )
 
 
@@ -165,43 +301,69 @@ def manager_dashboard():
     if session.get("user_role") != "manager":
         return redirect(url_for("login"))
 
-    user_id = session["user_id"]
-    user = users_table.get_item(Key={"id": user_id}).get("Item")
-
-    store_id = user.get("store_id")
-    inventory = inventory_table.scan(
-        FilterExpression="store_id = :s",
-        ExpressionAttributeValues={":s": store_id}
-    ).get("Items", [])
+    store_id = session.get("store_id")
+    if store_id is None:
+        # Sessions issued before store_id was cached at login
+        user = users_table.get_item(
+            Key={"id": session["user_id"]},
+            ProjectionExpression="store_id"
+        ).get("Item", {})
+        store_id = user.get("store_id")
+        if store_id:
+            session["store_id"] = store_id
+    # An S-typed index key cannot be queried with a null value
+    inventory = query_all(
+        inventory_table,
+        IndexName="store-index",
+        KeyConditionExpression=Key("store_id").eq(store_id)
+    ) if store_id else []
 
     if request.method == "POST":
         action = request.form.get("action")
 
         if action == "add_product":
-            product_id = str(uuid.uuid4())
-            products_table.put_item(Item={
-                "id": product_id,
-                "name": request.form["name"],
-                "sku": request.form["sku"],
-                "price": float(request.form["price"])
-            })
-
-            inventory_table.put_item(Item={
-                "id": str(uuid.uuid4()),
-                "store_id": store_id,
-                "product_id": product_id,
-                "quantity": 0,
-                "low_stock_threshold": 5
+            product_id = new_id()
+            # One BatchWriteItem call covers both tables
+            batch_write({
+                products_table.name: [{
+                    "id": product_id,
+                    "name": request.form["name"],
+                    "sku": request.form["sku"],
+                    "price": Decimal(request.form["price"])
+                }],
+                inventory_table.name: [{
+                    "id": new_id(),
+                    "store_id": store_id,
+                    "product_id": product_id,
+                    "quantity": 0,
+                    "low_stock_threshold": 5
+                }],
             })
             flash("Product added", "success")
 
         elif action == "update_quantity":
-            inventory_table.update_item(
-                Key={"id": request.form["inventory_id"]},
-                UpdateExpression="SET quantity = :q",
-                ExpressionAttributeValues={":q": int(request.form["quantity"])}
-            )
-            flash("Quantity updated", "success")
+            # A "delta" field adjusts stock atomically server-side; otherwise
+            # the absolute "quantity" from the form is written.
+            delta = request.form.get("delta")
+            if delta:
+                update = "ADD quantity :q"
+                value = int(delta)
+            else:
+                update = "SET quantity = :q"
+                value = int(request.form["quantity"])
+            try:
+                inventory_table.update_item(
+                    Key={"id": request.form["inventory_id"]},
+                    UpdateExpression=update,
+                    ConditionExpression="attribute_exists(id) AND store_id = :s",
+                    ExpressionAttributeValues={":q": value, ":s": store_id},
+                    ReturnValues="NONE"
+                )
+                flash("Quantity updated", "success")
+            except ClientError as e:
+                if not is_condition_failure(e):
+                    raise
+                flash("Inventory item not found", "danger")
 
     return render_template("manager_dashboard.html", inventory=inventory)
 
@@ -214,21 +376,39 @@ def supplier_dashboard():
     if session.get("user_role") != "supplier":
         return redirect(url_for("login"))
 
-    requests = restock_table.scan().get("Items", [])
+    # Approval is the only supplier action here, so only pending requests are
+    # read; approved history stays out of the index query
+    requests = query_all(
+        restock_table,
+        IndexName="status-index",
+        KeyConditionExpression=Key("status").eq("pending"),
+        ProjectionExpression=(
+            "id, inventory_id, store_id, product_id, quantity_requested, #s, notes"
+        ),
+        ExpressionAttributeNames={"#s": "status"}
+    )
 
     if request.method == "POST":
         req_id = request.form["request_id"]
-        restock_table.update_item(
-            Key={"id": req_id},
-            UpdateExpression="SET #s = :v",
-            ExpressionAttributeNames={"#s": "status"},
-            ExpressionAttributeValues={":v": "approved"}
-        )
-
-        send_notification(
-            "Restock Approved",
-            f"Restock request {req_id} approved"
-        )
+        try:
+            restock_table.update_item(
+                Key={"id": req_id},
+                UpdateExpression="SET #s = :v",
+                ConditionExpression="attribute_exists(id)",
+                ExpressionAttributeNames={"#s": "status"},
+                ExpressionAttributeValues={":v": "approved"},
+                ReturnValues="NONE"
+            )
+        except ClientError as e:
+            if not is_condition_failure(e):
+                raise
+            flash("Restock request not found", "danger")
+        else:
+            notification_executor.submit(
+                send_notification,
+                "Restock Approved",
+                f"Restock request {req_id} approved"
+            )
 
     return render_template("supplier_dashboard.html", requests=requests)
 
@@ -237,4 +417,5 @@ def supplier_dashboard():
 # App Runner
 # --------------------------------------------------
 if __name__ == "__main__":
-    app.run(host="0.0.0.0", port=5000, debug=True)
+    # Development server only; production runs under gunicorn (gunicorn.conf.py)
+    app.run(host="0.0.0.0", port=5000, debug=os.environ.get("FLASK_DEBUG") == "1")
@@ -9,6 +9,8 @@ If you don't have credentials yet, this script will show you what needs to be co
 import boto3
 import json
 import os
+import time
+from concurrent.futures import ThreadPoolExecutor
 from botocore.exceptions import ClientError, NoCredentialsError
 
 AWS_REGION = "us-east-1"
@@ -60,140 +62,121 @@ def check_aws_credentials():
         return False, None
 
 
-def create_dynamodb_tables():
-    """Create all DynamoDB tables"""
-    dynamodb = boto3.resource("dynamodb", region_name=AWS_REGION)
-    dynamodb_client = boto3.client("dynamodb", region_name=AWS_REGION)
-    
-    print("\nCreating DynamoDB tables...")
-    
-    # Users table with GSI for username lookup
-    try:
-        table = dynamodb.create_table(
-            TableName=TABLES["users"],
-            KeySchema=[{"AttributeName": "id", "KeyType": "HASH"}],
-            AttributeDefinitions=[
-                {"AttributeName": "id", "AttributeType": "S"},
-                {"AttributeName": "username", "AttributeType": "S"},
-            ],
-            GlobalSecondaryIndexes=[{
-                "IndexName": "username-index",
-                "KeySchema": [{"AttributeName": "username", "KeyType": "HASH"}],
-                "Projection": {"ProjectionType": "ALL"},
-            }],
-            BillingMode="PAY_PER_REQUEST",
+def _table_spec(table_name, index_name=None, index_key=None):
+    """Build create_table kwargs for an id-keyed table with an optional GSI"""
+    spec = {
+        "TableName": table_name,
+        "KeySchema": [{"AttributeName": "id", "KeyType": "HASH"}],
+        "AttributeDefinitions": [{"AttributeName": "id", "AttributeType": "S"}],
+        "BillingMode": "PAY_PER_REQUEST",
+    }
+    if index_name:
+        spec["AttributeDefinitions"].append(
+            {"AttributeName": index_key, "AttributeType": "S"}
         )
-        table.wait_until_exists()
-        print(f"✓ Created table: {TABLES['users']}")
-    except ClientError as e:
-        if e.response["Error"]["Code"] == "ResourceInUseException":
-            print(f"  Table {TABLES['users']} already exists")
-        else:
-            print(f"  Error creating {TABLES['users']}: {e}")
+        spec["GlobalSecondaryIndexes"] = [{
+            "IndexName": index_name,
+            "KeySchema": [{"AttributeName": index_key, "KeyType": "HASH"}],
+            "Projection": {"ProjectionType": "ALL"},
+        }]
+    return spec
+
+
+TABLE_SPECS = [
+    # Users table with GSI for username lookup
+    _table_spec(TABLES["users"], "username-index", "username"),
+    _table_spec(TABLES["stores"]),
+    # Products table with GSI for SKU lookup
+    _table_spec(TABLES["products"], "sku-index", "sku"),
+    # Inventory table with GSI for per-store lookup
+    _table_spec(TABLES["inventory"], "store-index", "store_id"),
+    _table_spec(TABLES["sales"]),
+    # Restock requests table with GSI for open-request lookup by status
+    _table_spec(TABLES["restock_requests"], "status-index", "status"),
+    _table_spec(TABLES["shipments"]),
+]
+
+
+def add_missing_indexes(dynamodb_client, spec):
+    """Add the spec's GSIs to a table created before they were declared
+
+    Returns the names of the indexes that were started; DynamoDB backfills
+    them in the background.
+    """
+    table_name = spec["TableName"]
+    table = dynamodb_client.describe_table(TableName=table_name)["Table"]
+    existing = {index["IndexName"] for index in table.get("GlobalSecondaryIndexes", [])}
     
-    # Stores table
-    try:
-        table = dynamodb.create_table(
-            TableName=TABLES["stores"],
-            KeySchema=[{"AttributeName": "id", "KeyType": "HASH"}],
-            AttributeDefinitions=[{"AttributeName": "id", "AttributeType": "S"}],
-            BillingMode="PAY_PER_REQUEST",
+    added = []
+    for index in spec.get("GlobalSecondaryIndexes", []):
+        if index["IndexName"] in existing:
+            continue
+        # One GSI creation per UpdateTable call
+        dynamodb_client.update_table(
+            TableName=table_name,
+            AttributeDefinitions=spec["AttributeDefinitions"],
+            GlobalSecondaryIndexUpdates=[{"Create": index}],
         )
-        table.wait_until_exists()
-        print(f"✓ Created table: {TABLES['stores']}")
-    except ClientError as e:
-        if e.response["Error"]["Code"] == "ResourceInUseException":
-            print(f"  Table {TABLES['stores']} already exists")
-        else:
-            print(f"  Error creating {TABLES['stores']}: {e}")
+        print(f"  Adding index {index['IndexName']} to {table_name}")
+        added.append((table_name, index["IndexName"]))
+    return added
+
+
+def wait_until_index_active(dynamodb_client, table_name, index_name, delay=20):
+    """Poll until a new GSI has finished backfilling"""
+    while True:
+        table = dynamodb_client.describe_table(TableName=table_name)["Table"]
+        statuses = {
+            index["IndexName"]: index["IndexStatus"]
+            for index in table.get("GlobalSecondaryIndexes", [])
+        }
+        if statuses.get(index_name) == "ACTIVE":
+            return table_name, index_name
+        time.sleep(delay)
+
+
+def create_dynamodb_tables():
+    """Create all DynamoDB tables, adding missing GSIs to existing ones"""
+    dynamodb_client = boto3.client("dynamodb", region_name=AWS_REGION)
     
-    # Products table with GSI for SKU lookup
-    try:
-        table = dynamodb.create_table(
-            TableName=TABLES["products"],
-            KeySchema=[{"AttributeName": "id", "KeyType": "HASH"}],
-            AttributeDefinitions=[
-                {"AttributeName": "id", "AttributeType": "S"},
-                {"AttributeName": "sku", "AttributeType": "S"},
-            ],
-            GlobalSecondaryIndexes=[{
-                "IndexName": "sku-index",
-                "KeySchema": [{"AttributeName": "sku", "KeyType": "HASH"}],
-                "Projection": {"ProjectionType": "ALL"},
-            }],
-            BillingMode="PAY_PER_REQUEST",
-        )
-        table.wait_until_exists()
-        print(f"✓ Created table: {TABLES['products']}")
-    except ClientError as e:
-        if e.response["Error"]["Code"] == "ResourceInUseException":
-            print(f"  Table {TABLES['products']} already exists")
-        else:
-            print(f"  Error creating {TABLES['products']}: {e}")
+    print("\nCreating DynamoDB tables...")
     
-    # Inventory table
-    try:
-        table = dynamodb.create_table(
-            TableName=TABLES["inventory"],
-            KeySchema=[{"AttributeName": "id", "KeyType": "HASH"}],
-            AttributeDefinitions=[{"AttributeName": "id", "AttributeType": "S"}],
-            BillingMode="PAY_PER_REQUEST",
-        )
-        table.wait_until_exists()
-        print(f"✓ Created table: {TABLES['inventory']}")
-    except ClientError as e:
-        if e.response["Error"]["Code"] == "ResourceInUseException":
-            print(f"  Table {TABLES['inventory']} already exists")
-        else:
-            print(f"  Error creating {TABLES['inventory']}: {e}")
+    # Issue every create first; DynamoDB provisions the tables in parallel
+    created = []
+    indexes = []
+    for spec in TABLE_SPECS:
+        table_name = spec["TableName"]
+        try:
+            dynamodb_client.create_table(**spec)
+            created.append(table_name)
+        except ClientError as e:
+            if e.response["Error"]["Code"] == "ResourceInUseException":
+                print(f"  Table {table_name} already exists")
+                try:
+                    indexes.extend(add_missing_indexes(dynamodb_client, spec))
+                except ClientError as e:
+                    print(f"  Error adding indexes to {table_name}: {e}")
+            else:
+                print(f"  Error creating {table_name}: {e}")
     
-    # Sales table
-    try:
-        table = dynamodb.create_table(
-            TableName=TABLES["sales"],
-            KeySchema=[{"AttributeName": "id", "KeyType": "HASH"}],
-            AttributeDefinitions=[{"AttributeName": "id", "AttributeType": "S"}],
-            BillingMode="PAY_PER_REQUEST",
-        )
-        table.wait_until_exists()
-        print(f"✓ Created table: {TABLES['sales']}")
-    except ClientError as e:
-        if e.response["Error"]["Code"] == "ResourceInUseException":
-            print(f"  Table {TABLES['sales']} already exists")
-        else:
-            print(f"  Error creating {TABLES['sales']}: {e}")
+    def wait_until_exists(table_name):
+        dynamodb_client.get_waiter("table_exists").wait(TableName=table_name)
+        return table_name
     
-    # Restock Requests table
-    try:
-        table = dynamodb.create_table(
-            TableName=TABLES["restock_requests"],
-            KeySchema=[{"AttributeName": "id", "KeyType": "HASH"}],
-            AttributeDefinitions=[{"AttributeName": "id", "AttributeType": "S"}],
-            BillingMode="PAY_PER_REQUEST",
-        )
-        table.wait_until_exists()
-        print(f"✓ Created table: {TABLES['restock_requests']}")
-    except ClientError as e:
-        if e.response["Error"]["Code"] == "ResourceInUseException":
-            print(f"  Table {TABLES['restock_requests']} already exists")
-        else:
-            print(f"  Error creating {TABLES['restock_requests']}: {e}")
+    # Waiting is I/O-bound polling, so threads overlap it fine
+    if created:
+        with ThreadPoolExecutor(max_workers=len(created)) as executor:
+            for table_name in executor.map(wait_until_exists, created):
+                print(f"✓ Created table: {table_name}")
     
-    # Shipments table
-    try:
-        table = dynamodb.create_table(
-            TableName=TABLES["shipments"],
-            KeySchema=[{"AttributeName": "id", "KeyType": "HASH"}],
-            AttributeDefinitions=[{"AttributeName": "id", "AttributeType": "S"}],
-            BillingMode="PAY_PER_REQUEST",
-        )
-        table.wait_until_exists()
-        print(f"✓ Created table: {TABLES['shipments']}")
-    except ClientError as e:
-        if e.response["Error"]["Code"] == "ResourceInUseException":
-            print(f"  Table {TABLES['shipments']} already exists")
-        else:
-            print(f"  Error creating {TABLES['shipments']}: {e}")
+    # The dashboards query these indexes, so wait for the backfill to finish
+    if indexes:
+        with ThreadPoolExecutor(max_workers=len(indexes)) as executor:
+            waits = executor.map(
+                lambda pair: wait_until_index_active(dynamodb_client, *pair), indexes
+            )
+            for table_name, index_name in waits:
+                print(f"✓ Index {index_name} active on {table_name}")
 
 
 def create_sns_topic():
@@ -241,6 +224,7 @@ def create_iam_policy():
                     "dynamodb:DeleteItem",
                     "dynamodb:Query",
                     "dynamodb:Scan",
+                    "dynamodb:BatchWriteItem",
                 ],
                 "Resource": [
                     f"arn:aws:dynamodb:{AWS_REGION}:*:table/stylelane-*",
@@ -0,0 +1,255 @@
+"""
+Shared pytest fixtures for the app_aws test suite
+Sets up moto-backed DynamoDB once per session, only for tests that take aws_mock,
+and cleans up after each of them
+"""
+import pytest
+import boto3
+from moto import mock_aws
+from werkzeug.security import generate_password_hash
+from concurrent.futures import Future, ThreadPoolExecutor
+from decimal import Decimal
+from types import SimpleNamespace
+import os
+import uuid
+from unittest.mock import MagicMock
+
+from aws_setup import TABLE_SPECS
+
+# Set dummy AWS credentials for testing
+os.environ["AWS_ACCESS_KEY_ID"] = "testing"
+os.environ["AWS_SECRET_ACCESS_KEY"] = "testing"
+os.environ["AWS_DEFAULT_REGION"] = "us-east-1"
+
+# Fixture key -> DynamoDB table name
+TABLE_NAMES = {
+    "users": "stylelane-users",
+    "stores": "stylelane-stores",
+    "products": "stylelane-products",
+    "inventory": "stylelane-inventory",
+    "sales": "stylelane-sales",
+    "restock": "stylelane-restock-requests",
+    "shipments": "stylelane-shipments",
+}
+
+# Single-iteration PBKDF2: same Werkzeug code path, none of the KDF cost.
+TEST_PASSWORD_HASH_METHOD = "pbkdf2:sha256:1"
+
+
+def _test_hash(password):
+    return generate_password_hash(password, method=TEST_PASSWORD_HASH_METHOD, salt_length=4)
+
+
+# Hash the fixture passwords once
+_ADMIN_PW_HASH = _test_hash("admin123")
+_MANAGER_PW_HASH = _test_hash("manager123")
+_SUPPLIER_PW_HASH = _test_hash("supplier123")
+
+# Fixed ids shared by the session-scoped rows and force_login
+_ADMIN_ID = uuid.UUID(int=1).hex
+_MANAGER_ID = uuid.UUID(int=2).hex
+_SUPPLIER_ID = uuid.UUID(int=3).hex
+_STORE_ID = uuid.UUID(int=4).hex
+_PRODUCT_ID = uuid.UUID(int=5).hex
+_INVENTORY_ID = uuid.UUID(int=6).hex
+
+_STORE_ITEM = {"id": _STORE_ID, "name": "Test Store", "location": "Test Location"}
+_USER_ITEMS = {
+    "admin": {
+        "id": _ADMIN_ID,
+        "username": "admin",
+        "password": _ADMIN_PW_HASH,
+        "role": "admin"
+    },
+    "manager": {
+        "id": _MANAGER_ID,
+        "username": "manager1",
+        "password": _MANAGER_PW_HASH,
+        "role": "manager",
+        "store_id": _STORE_ID
+    },
+    "supplier": {
+        "id": _SUPPLIER_ID,
+        "username": "supplier1",
+        "password": _SUPPLIER_PW_HASH,
+        "role": "supplier"
+    },
+}
+
+# Rows owned by the session-scoped fixtures; aws_mock keeps them
+_PRESERVED_IDS = {
+    _ADMIN_ID, _MANAGER_ID, _SUPPLIER_ID, _STORE_ID, _PRODUCT_ID, _INVENTORY_ID
+}
+
+# Table key -> {id: item} as written by the session fixtures, so aws_mock can
+# put back any row a test modified
+_SESSION_ROWS = {}
+
+
+def _put_session_row(services, key, item):
+    services[key].put_item(Item=item)
+    _SESSION_ROWS.setdefault(key, {})[item["id"]] = item
+
+
+class _InlineExecutor:
+    """Stands in for app_aws.notification_executor: runs each task on the calling
+    thread, so a publish can never land after the test that triggered it"""
+    def submit(self, fn, *args, **kwargs):
+        future = Future()
+        future.set_result(fn(*args, **kwargs))
+        return future
+
+
+@pytest.fixture(scope="session")
+def app_module():
+    """Import and configure app_aws once - no AWS calls are made
+
+    moto is imported above, so the module-level boto3 resource and clients
+    already carry its hooks and are intercepted once mock_aws_services starts.
+    """
+    import app_aws
+    
+    # No test needs a real topic; record publishes on a mock instead
+    app_aws.sns = MagicMock()
+    app_aws.notification_executor = _InlineExecutor()
+    app_aws.SNS_TOPIC_ARN = "arn:aws:sns:us-east-1:000000000000:stylelane-notifications"
+    app_aws.app.config['TESTING'] = True
+    app_aws.app.config['SECRET_KEY'] = 'test-secret-key'
+    return app_aws
+
+
+@pytest.fixture(scope="session")
+def mock_aws_services(app_module):
+    """Set up mocked AWS services - started once, by the first test that needs it
+
+    Routing-only tests that just take `client` never start moto.
+    Under pytest-xdist each worker is its own process with its own in-memory
+    moto backend, so workers can share table names without clashing.
+    """
+    with mock_aws():
+        # Create DynamoDB tables from the same specs aws_setup.py deploys
+        dynamodb = boto3.resource("dynamodb", region_name="us-east-1")
+        specs = {spec["TableName"]: spec for spec in TABLE_SPECS}
+        tables = {
+            key: dynamodb.create_table(**specs[name])
+            for key, name in TABLE_NAMES.items()
+        }
+        
+        # Wait for tables to be ready
+        with ThreadPoolExecutor(max_workers=len(tables)) as executor:
+            list(executor.map(lambda table: table.wait_until_exists(), tables.values()))
+        
+        yield {**tables, "app": app_module}
+
+
+@pytest.fixture
+def client(app_module):
+    """Create a test client"""
+    return app_module.app.test_client()
+
+
+@pytest.fixture
+def force_login(client, app_module):
+    """Write a role's session straight into the client, skipping /login"""
+    def login(role):
+        item = _USER_ITEMS[role]
+        with client.session_transaction() as sess:
+            sess["user_id"] = item["id"]
+            sess["user_role"] = item["role"]
+            sess["landing"] = app_module.ROLE_DASHBOARDS[item["role"]]
+            if "store_id" in item:
+                sess["store_id"] = item["store_id"]
+    return login
+
+
+@pytest.fixture
+def aws_mock(mock_aws_services):
+    """mock_aws_services for one test; empties the tables (except session rows)
+    and restores app config afterwards
+
+    Every test that touches DynamoDB takes this fixture, so the cleanup below
+    only runs where there is something to clean.
+    """
+    app = mock_aws_services["app"]
+    config = app.app.config.copy()
+    yield mock_aws_services
+    app.app.config.clear()
+    app.app.config.update(config)
+    for name, table in mock_aws_services.items():
+        if name == "app":
+            continue
+        items = table.scan(ProjectionExpression="id").get("Items", [])
+        with table.batch_writer() as batch:
+            for item in items:
+                if item["id"] not in _PRESERVED_IDS:
+                    batch.delete_item(Key={"id": item["id"]})
+    # Tests may update session rows (e.g. inventory quantity); restore them
+    if _SESSION_ROWS:
+        app.batch_write({
+            mock_aws_services[key].name: list(rows.values())
+            for key, rows in _SESSION_ROWS.items()
+        })
+    app.sns.reset_mock()
+    # Cached scans would otherwise leak rows between tests
+    app._scan_stores.cache_clear()
+    app._scan_managers.cache_clear()
+
+
+@pytest.fixture
+def seed(aws_mock):
+    """Put items into several tables with the app's own batch_write"""
+    def seed_tables(items_by_table):
+        aws_mock["app"].batch_write({
+            aws_mock[key].name: items for key, items in items_by_table.items()
+        })
+    return seed_tables
+
+
+@pytest.fixture(scope="session")
+def test_admin_user(mock_aws_services):
+    """Create a test admin user shared by the whole session"""
+    _put_session_row(mock_aws_services, "users", _USER_ITEMS["admin"])
+    return _ADMIN_ID
+
+
+@pytest.fixture(scope="session")
+def test_manager_user(mock_aws_services):
+    """Create a test manager user with store shared by the whole session"""
+    _put_session_row(mock_aws_services, "stores", _STORE_ITEM)
+    _put_session_row(mock_aws_services, "users", _USER_ITEMS["manager"])
+    return _MANAGER_ID, _STORE_ID
+
+
+@pytest.fixture(scope="session")
+def test_supplier_user(mock_aws_services):
+    """Create a test supplier user shared by the whole session"""
+    _put_session_row(mock_aws_services, "users", _USER_ITEMS["supplier"])
+    return _SUPPLIER_ID
+
+
+@pytest.fixture(scope="session")
+def seeded_world(mock_aws_services, test_manager_user):
+    """One low-stock product/inventory row in the manager's store, shared by the session
+
+    aws_mock writes both rows back after every test, so edits never leak.
+    """
+    manager_id, store_id = test_manager_user
+    _put_session_row(mock_aws_services, "products", {
+        "id": _PRODUCT_ID,
+        "name": "Seeded Product",
+        "sku": "SEED-001",
+        "price": Decimal("19.99")
+    })
+    _put_session_row(mock_aws_services, "inventory", {
+        "id": _INVENTORY_ID,
+        "store_id": store_id,
+        "product_id": _PRODUCT_ID,
+        "quantity": 2,
+        "low_stock_threshold": 5
+    })
+    return SimpleNamespace(
+        manager_id=manager_id,
+        store_id=store_id,
+        product_id=_PRODUCT_ID,
+        inventory_id=_INVENTORY_ID,
+    )
@@ -0,0 +1,13 @@
+"""
+Gunicorn settings for running app_aws in production
+Run with: gunicorn -c gunicorn.conf.py app_aws:app
+"""
+import multiprocessing
+
+bind = "0.0.0.0:5000"
+workers = multiprocessing.cpu_count() * 2 + 1
+
+# Import the app once in the master so workers fork with Flask, Jinja and the
+# boto3 clients already loaded (shared copy-on-write). No AWS call is made at
+# import time, so no HTTP connection is shared across the fork.
+preload_app = True